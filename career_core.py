@@ -0,0 +1,302 @@
+# Data model and logic shared by the Streamlit app. Imported modules run once
+# per process, while the app script itself reruns on every interaction.
+import itertools
+import math
+from typing import NamedTuple
+
+import numpy as np
+import streamlit as st
+
+# ==============================
+# LEVEL 0 — DATA MODEL
+# ==============================
+# You can extend this freely.
+JOBS_DB = [
+    {
+        "name": "Sports Journalist",
+        "tags": {"sport", "scrittura", "media"},
+        "description": "Raccontare eventi sportivi con articoli, video o podcast.",
+    },
+    {
+        "name": "UX Designer",
+        "tags": {"design", "psicologia", "tecnologia", "creativita"},
+        "description": "Progettazione di prodotti digitali centrati sulle persone.",
+    },
+    {
+        "name": "Data Analyst",
+        "tags": {"tecnologia", "numeri", "business", "analisi"},
+        "description": "Analisi dati per prendere decisioni migliori.",
+    },
+    {
+        "name": "Product Manager (Sport-Tech)",
+        "tags": {"sport", "tecnologia", "business", "leadership"},
+        "description": "Guida lo sviluppo di prodotti digitali nel mondo sportivo.",
+    },
+    {
+        "name": "Content Creator",
+        "tags": {"scrittura", "creativita", "media"},
+        "description": "Creazione di contenuti online su temi specifici.",
+    },
+    {
+        "name": "Mental Coach Sportivo",
+        "tags": {"sport", "psicologia", "coaching"},
+        "description": "Supporto mentale ad atleti e team.",
+    },
+    {
+        "name": "Game Designer",
+        "tags": {"tecnologia", "design", "creativita", "psicologia"},
+        "description": "Progettazione di videogiochi e dinamiche di gioco.",
+    },
+    {
+        "name": "Educatore Online",
+        "tags": {"insegnamento", "scrittura", "media", "tecnologia"},
+        "description": "Creazione di corsi e percorsi formativi digitali.",
+    },
+]
+
+DEFAULT_INTERESTS = [
+    "sport", "tecnologia", "psicologia", "scrittura", "musica", "design",
+    "business", "analisi", "creativita", "media", "coaching", "insegnamento",
+    "viaggi", "numeri", "leadership",
+]
+
+
+def tags_mask(tags, tag_index):
+    mask = 0
+    for tag in tags:
+        bit = tag_index.get(tag)
+        if bit is not None:
+            mask |= 1 << bit
+    return mask
+
+
+class JobsIndex(NamedTuple):
+    jobs: list  # JOBS_DB with frozen tags, "_tag_str" and the "_mask" int
+    tags: list  # bit position -> tag
+    tag_index: dict  # tag -> bit position
+    tag_counts: np.ndarray
+    tag_matrix: np.ndarray  # (jobs, tags) bool: job has tag
+    job_bit: dict  # job name -> bit, for the Level 3 rules
+    hybrid_rules: list
+
+
+@st.cache_resource(show_spinner=False)
+def load_jobs_index() -> JobsIndex:
+    """
+    All per-job precomputation, done once per process instead of on every
+    rerun. The returned object is shared between sessions: read-only.
+    """
+    jobs = [
+        {**job, "tags": frozenset(job["tags"]), "_tag_str": ", ".join(sorted(job["tags"]))}
+        for job in JOBS_DB
+    ]
+
+    # Tag vocabulary -> bit position. "_mask" is a plain Python int, so the
+    # vocabulary size is unbounded.
+    tags = sorted({t for job in jobs for t in job["tags"]})
+    tag_index = {tag: bit for bit, tag in enumerate(tags)}
+    for job in jobs:
+        job["_mask"] = tags_mask(job["tags"], tag_index)
+    tag_counts = np.array([len(job["tags"]) for job in jobs])
+    tag_matrix = np.array([[tag in job["tags"] for tag in tags] for job in jobs], dtype=bool)
+
+    job_bit = {job["name"]: 1 << i for i, job in enumerate(jobs)}
+    pm_mask = 0
+    for name, bit in job_bit.items():
+        if "Product Manager" in name:
+            pm_mask |= bit
+
+    # (jobs required all together, jobs of which at least one is required, idea)
+    hybrid_rules = [
+        (
+            job_bit["Sports Journalist"] | job_bit["UX Designer"],
+            0,
+            "UX Researcher per app sportive (unisce sport + psicologia + design)",
+        ),
+        (
+            job_bit["Data Analyst"] | job_bit["Content Creator"],
+            0,
+            "Data Storyteller (analisi dati + comunicazione)",
+        ),
+        (
+            0,
+            pm_mask,
+            "Founder di micro-prodotto digitale basato sulle tue passioni",
+        ),
+    ]
+
+    return JobsIndex(jobs, tags, tag_index, tag_counts, tag_matrix, job_bit, hybrid_rules)
+
+
+JOBS_INDEX = load_jobs_index()
+
+# ==============================
+# HELPERS
+# ==============================
+
+def normalize_items(text: str) -> tuple[str, ...]:
+    if not text.strip():
+        return ()
+    raw = [x.strip().lower() for x in text.split(",")]
+    return tuple(x for x in raw if x)
+
+
+def ordered_unique(items):
+    seen = set()
+    out = []
+    for x in items:
+        if x not in seen:
+            seen.add(x)
+            out.append(x)
+    return out
+
+
+def combinations_count(n: int) -> int:
+    """Number of non-empty combinations of n items (2^n - 1)."""
+    return 2 ** n - 1
+
+
+def _search_mask(items, search_term):
+    """Bitmask of the items containing search_term (all items if no search)."""
+    if not search_term:
+        return (1 << len(items)) - 1
+    mask = 0
+    for i, item in enumerate(items):
+        if search_term in item:
+            mask |= 1 << i
+    return mask
+
+
+def count_combinations(items, min_len, max_len, search_term=""):
+    """
+    Count combinations with length in [min_len, max_len] containing at least
+    one item that matches search_term, without enumerating them.
+    """
+    n = len(items)
+    k = _search_mask(items, search_term).bit_count()
+    return sum(math.comb(n, r) - math.comb(n - k, r) for r in range(min_len, max_len + 1))
+
+
+def _combination_blocks(n, min_len, max_len, match_mask):
+    """
+    Split the combinations to list into consecutive blocks (pool, fixed, r):
+    every `fixed` index plus r - len(fixed) indices chosen from `pool`.
+    With a search term each combination is grouped by its first matching
+    item, so it is generated exactly once and non-matching ones never are.
+    """
+    for r in range(min_len, max_len + 1):
+        if match_mask == (1 << n) - 1:
+            yield tuple(range(n)), (), r
+            continue
+        for m in range(n):
+            if match_mask >> m & 1:
+                before = tuple(i for i in range(m) if not match_mask >> i & 1)
+                yield before + tuple(range(m + 1, n)), (m,), r
+
+
+def generate_combinations(
+    items: tuple[str, ...], min_len: int, max_len: int, start: int, page_size: int, search_term: str = ""
+) -> list[tuple[str, ...]]:
+    """
+    Return only the requested page of combinations: whole blocks before
+    `start` are skipped by counting, so memory stays O(page_size).
+    """
+    match_mask = _search_mask(items, search_term)
+    page = []
+    for pool, fixed, r in _combination_blocks(len(items), min_len, max_len, match_mask):
+        free = r - len(fixed)
+        block_size = math.comb(len(pool), free)
+        if start >= block_size:
+            start -= block_size
+            continue
+        for c in itertools.islice(itertools.combinations(pool, free), start, start + page_size - len(page)):
+            page.append(tuple(items[i] for i in sorted(fixed + c)))
+        start = 0
+        if len(page) == page_size:
+            break
+    return page
+
+
+def score_jobs(user_mask: int, n_interests: int, obsession_weights=None):
+    """
+    Level 2 scoring, vectorized over all indexed jobs:
+    - coverage: how many job tags match user interests
+    - precision: overlap vs total job tags
+    - optional anti-obsession penalty
+    user_mask is built once per rerun by the caller; n_interests also counts
+    interests no job is tagged with, so it cannot be derived from the mask.
+    Returns one score per job, in JOBS_INDEX.jobs order.
+    """
+    user_vec = np.array([user_mask >> bit & 1 for bit in range(len(JOBS_INDEX.tags))])
+    n_overlap = JOBS_INDEX.tag_matrix @ user_vec
+
+    coverage = n_overlap / max(1, n_interests)
+    precision = n_overlap / np.maximum(1, JOBS_INDEX.tag_counts)
+    scores = 0.6 * precision + 0.4 * coverage
+
+    # LEVEL 4 — anti-obsession balancing
+    # Weights only exist for the user's interests, so a tag contributes to a
+    # job's penalty exactly when it is in the overlap.
+    if obsession_weights:
+        weights_vec = np.ones(len(JOBS_INDEX.tags))
+        for tag, w in obsession_weights.items():
+            bit = JOBS_INDEX.tag_index.get(tag)
+            if bit is not None:
+                weights_vec[bit] = w
+        penalty_by_tag = np.where(weights_vec > 1.0, (weights_vec - 1.0) * 0.05, 0.0)
+        scores = scores - JOBS_INDEX.tag_matrix @ penalty_by_tag
+
+    return np.where(n_overlap > 0, np.maximum(0.0, scores), 0.0)
+
+
+def _dot_id(name):
+    return '"' + name.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def edges_for_graph(user_mask, top_jobs):
+    """(interest, job name) pairs for the tags each job shares with user_mask."""
+    edges = []
+    for job in top_jobs:
+        shared = job["_mask"] & user_mask
+        while shared:
+            low = shared & -shared
+            edges.append((JOBS_INDEX.tags[low.bit_length() - 1], job["name"]))
+            shared ^= low
+    return edges
+
+
+def graph_dot(interests, top_jobs, edges):
+    """
+    DOT source of the interests <-> jobs graph. Layout and drawing happen in
+    the browser (st.graphviz_chart), so the server only builds this string.
+    """
+    return (
+        "graph G {\n"
+        + "".join(f"{_dot_id(i)} [shape=circle];\n" for i in interests)
+        + "".join(f"{_dot_id(job['name'])} [shape=box];\n" for job in top_jobs)
+        + "".join(f"{_dot_id(a)} -- {_dot_id(b)};\n" for a, b in edges)
+        + "}"
+    )
+
+
+def infer_hybrid_jobs(best_jobs):
+    """
+    LEVEL 3 — simple AI-like generation of new job ideas
+    based on tag clusters.
+    """
+    top_mask = 0
+    for j in best_jobs[:5]:
+        top_mask |= JOBS_INDEX.job_bit[j["name"]]
+
+    suggestions = [
+        idea
+        for all_of, any_of, idea in JOBS_INDEX.hybrid_rules
+        if (top_mask & all_of) == all_of and (not any_of or top_mask & any_of)
+    ]
+
+    if not suggestions:
+        suggestions.append(
+            "Portfolio career: combina 2-3 attività part-time invece di un solo lavoro"
+        )
+
+    return suggestions
@@ -1,139 +1,22 @@
 import streamlit as st
+import heapq
 import itertools
-from collections import defaultdict
-try:
-    import networkx as nx
-except ModuleNotFoundError:
-    nx = None
-import matplotlib.pyplot as plt
-
-# ==============================
-# LEVEL 0 — DATA MODEL
-# ==============================
-# You can extend this freely.
-JOBS_DB = [
-    {
-        "name": "Sports Journalist",
-        "tags": {"sport", "scrittura", "media"},
-        "description": "Raccontare eventi sportivi con articoli, video o podcast.",
-    },
-    {
-        "name": "UX Designer",
-        "tags": {"design", "psicologia", "tecnologia", "creativita"},
-        "description": "Progettazione di prodotti digitali centrati sulle persone.",
-    },
-    {
-        "name": "Data Analyst",
-        "tags": {"tecnologia", "numeri", "business", "analisi"},
-        "description": "Analisi dati per prendere decisioni migliori.",
-    },
-    {
-        "name": "Product Manager (Sport-Tech)",
-        "tags": {"sport", "tecnologia", "business", "leadership"},
-        "description": "Guida lo sviluppo di prodotti digitali nel mondo sportivo.",
-    },
-    {
-        "name": "Content Creator",
-        "tags": {"scrittura", "creativita", "media"},
-        "description": "Creazione di contenuti online su temi specifici.",
-    },
-    {
-        "name": "Mental Coach Sportivo",
-        "tags": {"sport", "psicologia", "coaching"},
-        "description": "Supporto mentale ad atleti e team.",
-    },
-    {
-        "name": "Game Designer",
-        "tags": {"tecnologia", "design", "creativita", "psicologia"},
-        "description": "Progettazione di videogiochi e dinamiche di gioco.",
-    },
-    {
-        "name": "Educatore Online",
-        "tags": {"insegnamento", "scrittura", "media", "tecnologia"},
-        "description": "Creazione di corsi e percorsi formativi digitali.",
-    },
-]
-
-DEFAULT_INTERESTS = [
-    "sport", "tecnologia", "psicologia", "scrittura", "musica", "design",
-    "business", "analisi", "creativita", "media", "coaching", "insegnamento",
-    "viaggi", "numeri", "leadership",
-]
-
-# ==============================
-# HELPERS
-# ==============================
-
-def normalize_items(text: str):
-    raw = [x.strip().lower() for x in text.split(",")]
-    return [x for x in raw if x]
-
-
-def generate_combinations(items):
-    combos = []
-    for r in range(1, len(items) + 1):
-        combos.extend(itertools.combinations(items, r))
-    return combos
-
-
-def score_job(user_interests, job_tags, obsession_weights=None):
-    """
-    Level 2 scoring:
-    - coverage: how many job tags match user interests
-    - precision: overlap vs total job tags
-    - optional anti-obsession penalty
-    """
-    user_set = set(user_interests)
-    overlap = user_set.intersection(job_tags)
-
-    if not overlap:
-        return 0.0
-
-    coverage = len(overlap) / max(1, len(user_set))
-    precision = len(overlap) / max(1, len(job_tags))
-    base_score = 0.6 * precision + 0.4 * coverage
-
-    # LEVEL 4 — anti-obsession balancing
-    penalty = 0.0
-    if obsession_weights:
-        for i in overlap:
-            w = obsession_weights.get(i, 1.0)
-            if w > 1.0:
-                penalty += (w - 1.0) * 0.05
-
-    return max(0.0, base_score - penalty)
-
-
-def infer_hybrid_jobs(best_jobs):
-    """
-    LEVEL 3 — simple AI-like generation of new job ideas
-    based on tag clusters.
-    """
-    suggestions = []
-    names = [j["name"] for j in best_jobs[:5]]
-
-    if "Sports Journalist" in names and "UX Designer" in names:
-        suggestions.append(
-            "UX Researcher per app sportive (unisce sport + psicologia + design)"
-        )
-
-    if "Data Analyst" in names and "Content Creator" in names:
-        suggestions.append(
-            "Data Storyteller (analisi dati + comunicazione)"
-        )
-
-    if any("Product Manager" in n for n in names):
-        suggestions.append(
-            "Founder di micro-prodotto digitale basato sulle tue passioni"
-        )
-
-    if not suggestions:
-        suggestions.append(
-            "Portfolio career: combina 2-3 attività part-time invece di un solo lavoro"
-        )
-
-    return suggestions
-
+import pandas as pd
+
+from career_core import (
+    DEFAULT_INTERESTS,
+    JOBS_INDEX,
+    combinations_count,
+    count_combinations,
+    edges_for_graph,
+    generate_combinations,
+    graph_dot,
+    infer_hybrid_jobs,
+    normalize_items,
+    ordered_unique,
+    score_jobs,
+    tags_mask,
+)
 
 # ==============================
 # STREAMLIT UI (LEVEL 1)
@@ -168,33 +51,61 @@ with st.sidebar:
     st.caption("Alza un interesse se senti che domina troppo: il ranking lo bilancerà.")
 
 # Merge interests
-custom_items = normalize_items(custom_text) if custom_text else []
-interests = list(dict.fromkeys(selected_defaults + custom_items))
+custom_items = normalize_items(custom_text)
+if not custom_items:
+    interests = list(selected_defaults)
+else:
+    interests = ordered_unique(itertools.chain(selected_defaults, custom_items))
 
 if not interests:
     st.info("Inserisci almeno un interesse per iniziare.")
     st.stop()
 
-# Anti-obsession weights
-obsession_weights = {}
+# Interests as tag bits, shared by scoring and the graph.
+user_mask = tags_mask(interests, JOBS_INDEX.tag_index)
+
+# Anti-obsession weights: one editable table instead of one slider per interest.
+# The table is re-seeded only when the interests change (carrying over the
+# previous weights), otherwise every edit would reset the editor. Rows are
+# indexed by interest so the editor's identity (and its positional edits)
+# changes with the interests instead of sticking to row numbers.
+weights_seed = st.session_state.get("weights_seed")
+if weights_seed is None or weights_seed[0] != tuple(interests):
+    previous = st.session_state.get("obsession_weights", {})
+    weights_seed = (tuple(interests), [previous.get(i, 1.0) for i in interests])
+    st.session_state["weights_seed"] = weights_seed
+
 with st.sidebar:
-    for i in interests:
-        obsession_weights[i] = st.slider(
-            f"Peso {i}", min_value=1.0, max_value=3.0, value=1.0, step=0.1
-        )
+    weights_df = pd.DataFrame(
+        {"weight": weights_seed[1]}, index=pd.Index(interests, name="interest")
+    )
+    edited = st.data_editor(
+        weights_df,
+        column_config={
+            "_index": st.column_config.TextColumn("Interesse"),
+            "weight": st.column_config.NumberColumn(
+                "Peso", min_value=1.0, max_value=3.0, step=0.1, required=True
+            ),
+        },
+        key="weights",
+    )
+
+obsession_weights = dict(zip(edited.index, edited["weight"]))
+st.session_state["obsession_weights"] = obsession_weights
 
 # ==============================
 # LEVEL 1 — combinations engine
 # ==============================
 
-combos = generate_combinations(interests)
+combos_total = combinations_count(len(interests))
 
-col1, col2 = st.columns([1, 2])
-
-with col1:
-    st.subheader("🔢 Combinazioni generate")
-    st.metric("Totale combinazioni", len(combos))
 
+@st.fragment
+def render_combinations_viewer(interests):
+    """
+    Filters and pagination of the combinations list. Running as a fragment,
+    its widgets rerun only this block, not scoring, graph and suggestions.
+    """
     with st.expander("Mostra tutte le combinazioni"):
         st.caption("Suggerimento: usa filtri e paginazione per esplorare molte combinazioni.")
 
@@ -211,49 +122,51 @@ with col1:
             placeholder="es. tecnologia",
         ).strip().lower()
 
-        filtered_combos = [
-            c for c in combos
-            if min_len <= len(c) <= max_len
-            and (not search_term or search_term in " ".join(c).lower())
-        ]
+        filtered_total = count_combinations(interests, min_len, max_len, search_term)
 
-        st.metric("Combinazioni mostrate", len(filtered_combos))
+        st.metric("Combinazioni mostrate", filtered_total)
 
         page_size = st.selectbox("Elementi per pagina", [25, 50, 100, 250], index=1)
-        total_pages = max(1, (len(filtered_combos) + page_size - 1) // page_size)
+        total_pages = max(1, (filtered_total + page_size - 1) // page_size)
         page = st.number_input("Pagina", min_value=1, max_value=total_pages, value=1, step=1)
 
         start = (page - 1) * page_size
-        end = start + page_size
 
-        for c in filtered_combos[start:end]:
-            st.write("• " + " + ".join(c))
+        page_combos = generate_combinations(tuple(interests), min_len, max_len, start, page_size, search_term)
+        st.markdown("\n".join("- " + " + ".join(c) for c in page_combos))
 
         st.caption(f"Pagina {page} di {total_pages}")
 
+
+col1, col2 = st.columns([1, 2])
+
+with col1:
+    st.subheader("🔢 Combinazioni generate")
+    st.metric("Totale combinazioni", combos_total)
+
+    render_combinations_viewer(interests)
+
 # ==============================
 # LEVEL 2 — ranking jobs
 # ==============================
 
-scored = []
-for job in JOBS_DB:
-    s = score_job(interests, job["tags"], obsession_weights)
-    if s > 0:
-        scored.append((s, job))
+scores = score_jobs(user_mask, len(interests), obsession_weights)
+scored = [(float(s), job) for s, job in zip(scores, JOBS_INDEX.jobs) if s > 0]
 
-scored.sort(key=lambda x: x[0], reverse=True)
+# Only the top 10 are shown (and the top 5 feed Level 3): no full sort needed.
+top = heapq.nlargest(10, scored, key=lambda x: x[0])
 
 with col2:
     st.subheader("⭐ Lavori consigliati (ranking intelligente)")
 
-    if not scored:
+    if not top:
         st.warning("Nessuna corrispondenza trovata. Prova ad aggiungere altri interessi.")
     else:
-        for score, job in scored[:10]:
+        for score, job in top:
             pct = int(score * 100)
             st.markdown(f"### {job['name']} — {pct}% fit")
             st.write(job["description"])
-            st.caption("Tag: " + ", ".join(sorted(job["tags"])))
+            st.caption("Tag: " + job["_tag_str"])
             st.progress(min(score, 1.0))
 
 # ==============================
@@ -263,39 +176,11 @@ with col2:
 st.subheader("🕸️ Mappa interessi ↔ lavori")
 
 with st.expander("Mostra mappa interattiva"):
-    if nx is None:
-        st.error("La libreria 'networkx' non è installata. Aggiungi 'networkx' al file requirements.txt su Streamlit Cloud e fai redeploy.")
-    elif scored:
-        G = nx.Graph()
-
-        # nodi interessi
-        for i in interests:
-            G.add_node(i, node_type="interest")
-
-        # nodi lavori (solo top 10)
-        top_jobs = [job for _, job in scored[:10]]
-        for job in top_jobs:
-            G.add_node(job["name"], node_type="job")
-            for tag in job["tags"]:
-                if tag in interests:
-                    G.add_edge(tag, job["name"])
-
-        fig = plt.figure(figsize=(10, 7))
-        pos = nx.spring_layout(G, seed=42)
-
-        interest_nodes = [n for n, d in G.nodes(data=True) if d.get("node_type") == "interest"]
-        job_nodes = [n for n, d in G.nodes(data=True) if d.get("node_type") == "job"]
-
-        nx.draw_networkx_nodes(G, pos, nodelist=interest_nodes, node_size=700)
-        nx.draw_networkx_nodes(G, pos, nodelist=job_nodes, node_size=1200)
-        nx.draw_networkx_edges(G, pos, alpha=0.5)
-        nx.draw_networkx_labels(G, pos, font_size=9)
-
-        plt.axis("off")
-        st.pyplot(fig)
-        plt.close(fig)
-
-        st.caption("I nodi piccoli sono interessi, quelli grandi sono lavori consigliati. Le linee mostrano le connessioni tramite tag condivisi.")
+    if top:
+        top_jobs = [job for _, job in top]
+        st.graphviz_chart(graph_dot(interests, top_jobs, edges_for_graph(user_mask, top_jobs)))
+
+        st.caption("I cerchi sono interessi, i rettangoli sono lavori consigliati. Le linee mostrano le connessioni tramite tag condivisi.")
     else:
         st.info("Aggiungi interessi per generare la mappa.")
 
@@ -304,10 +189,9 @@ with st.expander("Mostra mappa interattiva"):
 # ==============================
 
 st.subheader("🧠 Idee di carriera generate (Level 3)")
-if scored:
-    hybrid = infer_hybrid_jobs([j for _, j in scored])
-    for idea in hybrid:
-        st.write("• " + idea)
+if top:
+    hybrid = infer_hybrid_jobs([j for _, j in top])
+    st.markdown("\n".join("- " + idea for idea in hybrid))
 
 # ==============================
 # EXTRA: Explain levels
@@ -328,7 +212,7 @@ with st.expander("📚 Come sono implementati i 4 livelli"):
 - Generazione di ruoli ibridi da pattern di interessi
 
 **Level 4 — Anti-ossessione**
-- Slider per bilanciare interessi dominanti
+- Tabella dei pesi (1.0–3.0) per bilanciare interessi dominanti
 - Penalità nel ranking per suggerire percorsi più equilibrati
 
 Puoi estendere facilmente: